@@ -1,10 +1,15 @@
 import calendar
+import concurrent.futures
 import csv
-import multiprocessing
+import queue
 import sys
-from functools import partial
+import threading
+import time
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
@@ -16,155 +21,392 @@ import argparse
 
 SCOPES = ['https://www.googleapis.com/auth/photoslibrary.readonly']
 BASE_PATH = "./photos"
-
-
-def create_folder_structure(base_path, year, month, day):
+MAX_WORKERS = 32
+WORKER_POOL_SIZE = 4
+RATE_LIMIT = 100
+SCHEDULE_BATCH_SIZE = 100
+POSTFIX_INTERVAL = 0.2
+CHUNK_SIZE = 1024 * 1024
+CSV_FIELDNAMES = ['id', 'filename', 'creationTime', 'baseUrl', 'mimeType', 'width', 'height']
+
+
+def create_session(pool_size):
+    session = requests.Session()
+    # Downloads are copied from the raw stream, so ask for the bytes as stored rather than gzip-encoded;
+    # that also keeps content-length equal to the size of the file written
+    session.headers['Accept-Encoding'] = 'identity'
+    session.mount("https://", HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    ))
+    return session
+
+
+# requests.Session isn't thread-safe, so every download thread gets its own,
+# created once per worker so its connections (and TLS handshakes) are reused across downloads
+worker_state = threading.local()
+
+
+def init_worker():
+    worker_state.session = create_session(WORKER_POOL_SIZE)
+
+
+class RateLimiter:
+    """Token bucket shared by the download threads to stay under Google's per-second quota."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve a token now and sleep outside the lock until it becomes available
+            self.tokens -= 1
+            wait = -self.tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+
+def get_folder_path(base_path, year, month, day):
     month_name = calendar.month_abbr[month]
-    folder_path = os.path.join(base_path, str(year), month_name, str(day))
-    os.makedirs(folder_path, exist_ok=True)
-    return folder_path
+    return os.path.join(base_path, str(year), month_name, str(day))
 
 
 def parse_timestamp(timestamp):
+    # Only the date is needed, so slice it out of the ISO-8601 string rather than running strptime
     try:
-        return datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ")
+        if timestamp[4] == '-' and timestamp[7] == '-':
+            return int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10])
+    except (IndexError, ValueError):
+        pass
+    try:
+        parsed = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ")
     except ValueError:
-        return datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%fZ")
+        parsed = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%fZ")
+    return parsed.year, parsed.month, parsed.day
+
 
+def get_base_path(root, max_dim=None):
+    # Resized downloads get their own tree so re-runs never mistake them for originals (or vice versa)
+    return f"{root}_{max_dim}px" if max_dim else root
 
-def download_item(base_path, item):
-    filename = item['filename']
-    creation_time = parse_timestamp(item['mediaMetadata']['creationTime'])
-    year = creation_time.year
-    month = creation_time.month
-    day = creation_time.day
 
-    folder_path = create_folder_structure(base_path, year, month, day)
-    file_path = os.path.join(folder_path, filename)
-    if os.path.exists(file_path):
-        return 0, filename, 0, file_path, True
+def plan_download(base_path, item, max_dim=None):
+    # Resolve everything a worker needs up front so the threads only do the transfer
+    year, month, day = parse_timestamp(item['mediaMetadata']['creationTime'])
+    file_path = os.path.join(get_folder_path(base_path, year, month, day), item['filename'])
 
     media_type = item.get('mimeType', '')
     base_url = item['baseUrl']
     # Define the download URL
-    url = f"{base_url}=dv" if "video" in media_type else f"{base_url}=d"
-    response = requests.get(url, stream=True)
-
-    file_size = int(response.headers.get('content-length', 0))
-    if file_size == 0:
-        print(f"File {file_path} size cannot be zero, please retry")
-        return 0, filename, 0, file_path, True
-
-    # Open the output file in binary mode
-    with open(file_path, 'wb') as file:
-        # Create a progress bar using tqdm
-        with tqdm(total=file_size, unit='B', unit_scale=True, desc=file_path, ascii=True) as pbar:
-            # Iterate over the response data in chunks
-            for data in response.iter_content(chunk_size=1024*1024):
-                # Write the chunk to the file
-                file.write(data)
-                # Update the progress bar
-                pbar.update(len(data))
-
-    human_readable_size = humanize.naturalsize(file_size)
-    return file_size, filename, human_readable_size, file_path, False
+    if "video" in media_type:
+        url = f"{base_url}=dv"
+    elif max_dim and media_type == 'image/jpeg':
+        # Scaled photos come back as JPEG, so only scale items that are JPEG already; anything else
+        # (HEIC, PNG, GIF, RAW) would end up as JPEG bytes under its original extension
+        url = f"{base_url}=w{max_dim}-h{max_dim}"
+    else:
+        url = f"{base_url}=d"
+    return {'filename': item['filename'], 'file_path': file_path, 'url': url}
 
 
+def estimate_size(item):
+    # Rough relative size, only used to order downloads
+    metadata = item['mediaMetadata']
+    if 'video' in metadata or 'video' in item.get('mimeType', ''):
+        return float('inf')
+    return int(metadata.get('width', 0)) * int(metadata.get('height', 0))
 
-def fetch_items_from_api(service, body):
-    # Retrieve photos
-    items = []
-    while True:
-        results = service.mediaItems().search(
-            body=body
-        ).execute()
-        items.extend(results.get('mediaItems', []))
-        page_token = results.get('nextPageToken')
-        body["pageToken"] = page_token
-        print(f"Loading {len(items)} items")
-        if not page_token:
-            break
-    print(f"Loaded {len(items)} items")
-    return items
 
+def largest_first(items, batch_size):
+    # Start big downloads before small ones so a single large video doesn't hold up the end of the run.
+    # Sorting per batch keeps the items streaming instead of waiting for the whole list
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield from sorted(batch, key=estimate_size, reverse=True)
+            batch = []
+    yield from sorted(batch, key=estimate_size, reverse=True)
 
-def save_items_to_csv(csv_file, items):
-    with open(csv_file, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['id', 'filename', 'creationTime', 'baseUrl']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
 
-        writer.writeheader()
-        for item in items:
-            writer.writerow({
-                'id': item['id'],
-                'filename': item['filename'],
-                'creationTime': item['mediaMetadata']['creationTime'],
-                'baseUrl': item['baseUrl']
-            })
+def prepare_folder(folder):
+    # One listing per day folder instead of a stat() per item, creating the folder if missing
+    try:
+        with os.scandir(folder) as entries:
+            return {entry.path for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        os.makedirs(folder, exist_ok=True)
+        return set()
+
+
+def download_item(file_path, url, rate_limiter=None, durable=False, stop=None):
+    if rate_limiter:
+        rate_limiter.acquire()
+    if stop and stop.is_set():
+        raise concurrent.futures.CancelledError()
+    try:
+        with worker_state.session.get(url, stream=True) as response:
+            # An expired or rejected baseUrl returns an error page that must not be saved as the photo
+            response.raise_for_status()
+            file_size = int(response.headers.get('content-length', 0))
+            if file_size == 0:
+                print(f"File {file_path} size cannot be zero, please retry")
+                return 0
+
+            # Download into a temporary file and only move it into place once complete,
+            # so an interrupted download is never mistaken for a finished one
+            tmp_path = f"{file_path}.part"
+            try:
+                # Open the output file in binary mode
+                with open(tmp_path, 'wb') as file:
+                    # Stream the body straight into the file, tracking writes with tqdm and giving up
+                    # between chunks once the run is stopping
+                    with tqdm.wrapattr(file, 'write', total=file_size, desc=file_path, ascii=True) as output:
+                        while chunk := response.raw.read(CHUNK_SIZE):
+                            if stop and stop.is_set():
+                                raise concurrent.futures.CancelledError()
+                            output.write(chunk)
+                    # Not every urllib3 version enforces content-length, so check for a cut-off body here
+                    written = file.tell()
+                    if written != file_size:
+                        raise OSError(f"Incomplete download of {file_path}: got {written} of {file_size} bytes")
+                    if durable:
+                        file.flush()
+                        os.fsync(file.fileno())
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            os.replace(tmp_path, file_path)
+    except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as error:
+        # A single bad item shouldn't stop the run; report it and let the next run retry it
+        hint = ""
+        if isinstance(error, requests.HTTPError) and error.response.status_code == 403:
+            hint = " (the cached baseUrl may have expired, re-run with --disable-cache)"
+        tqdm.write(f"Failed to download {file_path}: {error}{hint}")
+        return None
+
+    return file_size
+
+
+def fetch_items_from_api(service, bodies):
+    # Page through all the searches together, sending each round of pages as one batch HTTP request,
+    # and yield items as they come so callers can work on them while the next round is fetched
+    pending = list(bodies)
+    item_count = 0
+    while pending:
+        responses = {}
+        errors = []
+
+        def collect(request_id, response, exception):
+            if exception is not None:
+                errors.append(exception)
+            else:
+                responses[request_id] = response
+
+        batch = service.new_batch_http_request(callback=collect)
+        for index, body in enumerate(pending):
+            batch.add(service.mediaItems().search(body=body), request_id=str(index))
+        batch.execute()
+        if errors:
+            raise errors[0]
+
+        next_pending = []
+        for index, body in enumerate(pending):
+            results = responses[str(index)]
+            page = results.get('mediaItems', [])
+            item_count += len(page)
+            yield from page
+            page_token = results.get('nextPageToken')
+            if page_token:
+                next_pending.append({**body, "pageToken": page_token})
+        tqdm.write(f"Loading {item_count} items")
+        pending = next_pending
+    tqdm.write(f"Loaded {item_count} items")
+
+
+def cache_items_to_csv(csv_file, items):
+    # Write items to the cache as they pass through, so saving overlaps with fetching and downloading.
+    # The rows go to a temporary file first so an interrupted run never leaves a partial cache behind
+    tmp_file = f"{csv_file}.tmp"
+    try:
+        with open(tmp_file, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+
+            writer.writerow(CSV_FIELDNAMES)
+            for item in items:
+                metadata = item['mediaMetadata']
+                writer.writerow((item['id'], item['filename'], metadata['creationTime'], item['baseUrl'],
+                                 item.get('mimeType', ''), metadata.get('width', ''), metadata.get('height', '')))
+                yield item
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    os.replace(tmp_file, csv_file)
 
 
 def load_items_from_csv(csv_file):
     items = []
     with open(csv_file, 'r', newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
+        reader = csv.reader(csvfile)
+        # Resolve column positions once from the header instead of building a dict per row
+        header = next(reader)
+        id_col, filename_col, creation_time_col, base_url_col = (header.index(name) for name in CSV_FIELDNAMES[:4])
+        # Caches written by older versions lack the mimeType and size columns
+        mime_type_col, width_col, height_col = (
+            header.index(name) if name in header else None for name in CSV_FIELDNAMES[4:]
+        )
         for row in reader:
-            items.append({
-                'id': row['id'],
-                'filename': row['filename'],
-                'mediaMetadata': {'creationTime': row['creationTime']},
-                'baseUrl': row['baseUrl']
-            })
+            item = {
+                'id': row[id_col],
+                'filename': row[filename_col],
+                'mediaMetadata': {'creationTime': row[creation_time_col]},
+                'baseUrl': row[base_url_col]
+            }
+            if mime_type_col is not None and row[mime_type_col]:
+                item['mimeType'] = row[mime_type_col]
+            for name, col in (('width', width_col), ('height', height_col)):
+                if col is not None and row[col]:
+                    item['mediaMetadata'][name] = row[col]
+            items.append(item)
     return items
 
 
-def handle_month(service, month, year, ignore_cache=False):
-    # Format dates for API
-    date_filter = {
-        'ranges': [{
-            'startDate': {'year': year, 'month': month, 'day': 1},
-            'endDate': {'year': year, 'month': month, 'day': 31}
-        }]
-    }
+def load_month_items(service, month, year, ignore_cache=False):
+    _, last_day = calendar.monthrange(year, month)
+    # Split the month into week-long ranges so their pages can be fetched side by side in one batch
+    day_ranges = [(1, 7), (8, 14), (15, 21), (22, last_day)]
     csv_file = f'video_{year}_{month}.csv'
     # Check if CSV file exists
     if not ignore_cache and os.path.exists(csv_file):
-        print("Loading items from CSV...")
-        items = load_items_from_csv(csv_file)
+        tqdm.write("Loading items from CSV...")
+        # The whole month is in hand, so order all of it largest first rather than batch by batch
+        items = sorted(load_items_from_csv(csv_file), key=estimate_size, reverse=True)
     else:
-        print("Fetching items from API...")
-        body = {
+        tqdm.write("Fetching items from API...")
+        bodies = [{
             "pageSize": "100",
             "pageToken": None,
             "filters": {
-                "dateFilter": date_filter
+                "dateFilter": {
+                    'ranges': [{
+                        'startDate': {'year': year, 'month': month, 'day': start_day},
+                        'endDate': {'year': year, 'month': month, 'day': end_day}
+                    }]
+                }
             }
-        }
-        items = fetch_items_from_api(service, body)
-        save_items_to_csv(csv_file, items)
-    handle_items(items)
+        } for start_day, end_day in day_ranges]
+        items = cache_items_to_csv(csv_file, fetch_items_from_api(service, bodies))
+    return items
 
-def handle_items(items, base_path=None):
-    total_items = len(items)
+
+def prefetch_month_items(fetcher, service, month, year, ignore_cache=False, stop=None):
+    # Load the month on the fetcher thread and hand its items over through a queue.
+    # Loading stops early once the run is stopping or the consumer has gone away
+    loaded = queue.Queue()
+    abandoned = threading.Event()
+
+    def produce():
+        try:
+            for item in load_month_items(service, month, year, ignore_cache):
+                if abandoned.is_set() or (stop and stop.is_set()):
+                    break
+                loaded.put(item)
+        finally:
+            loaded.put(None)
+
+    future = fetcher.submit(produce)
+
+    def consume():
+        try:
+            while (item := loaded.get()) is not None:
+                yield item
+        finally:
+            abandoned.set()
+        # Surface any error raised while loading
+        future.result()
+
+    return consume()
+
+def handle_items(items, base_path=None, workers=MAX_WORKERS, rate_limit=RATE_LIMIT, max_dim=None,
+                 durable=False, on_draining=None):
+    base_path = base_path or get_base_path(BASE_PATH, max_dim)
+    rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+    total_items = 0
     skipped_count = 0
-    # Use multiprocessing to download items in parallel
-    base_path = base_path or BASE_PATH
-    with multiprocessing.Pool(processes=8) as pool:
-        download_func = partial(download_item, base_path)
-
-        # Use tqdm to show progress
-        with tqdm(total=total_items, desc="Downloading", unit="item") as pbar:
-            results = []
-            for result in pool.imap_unordered(download_func, items):
-                file_size, filename, human_readable_size, file_path, is_skipped = result
-                skipped_count += int(is_skipped)
-                results.append(file_size)
-                pbar.update(1)
-                pbar.set_postfix({"Last": f"{filename} ({human_readable_size})"})
-
-    total_size = sum(results)
-
-    print(f"\nTotal items downloaded: {total_items - skipped_count}")
+    results = []
+    existing = {}
+    plans = {}
+    completed = queue.Queue()
+    stop = threading.Event()
+    next_postfix_at = 0
+    # Downloads are network bound, so threads give the same parallelism as processes
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers, initializer=init_worker) as pool, \
+            tqdm(total=0, desc="Downloading", unit="item") as pbar:
+
+        def record_result(future):
+            nonlocal next_postfix_at
+            file_size = future.result()
+            results.append(file_size)
+            # Only format the last item a few times a second; the update below redraws the bar
+            now = time.monotonic()
+            if file_size is not None and now >= next_postfix_at:
+                next_postfix_at = now + POSTFIX_INTERVAL
+                pbar.set_postfix({"Last": f"{plans[future]['filename']} ({humanize.naturalsize(file_size)})"},
+                                 refresh=False)
+            pbar.update(1)
+
+        try:
+            # Items are submitted as they stream in, so downloads start while later pages are still loading
+            for item in largest_first(items, SCHEDULE_BATCH_SIZE):
+                total_items += 1
+                pbar.total = total_items
+                plan = plan_download(base_path, item, max_dim)
+                folder = os.path.dirname(plan['file_path'])
+                if folder not in existing:
+                    existing[folder] = prepare_folder(folder)
+                if plan['file_path'] in existing[folder]:
+                    skipped_count += 1
+                    pbar.update(1)
+                else:
+                    future = pool.submit(download_item, plan['file_path'], plan['url'], rate_limiter, durable, stop)
+                    plans[future] = plan
+                    # Another item with the same name on the same day would write to the same file
+                    existing[folder].add(plan['file_path'])
+                    future.add_done_callback(completed.put)
+                while not completed.empty():
+                    record_result(completed.get())
+
+            while len(results) < len(plans):
+                # Once only the final round of downloads is left, let the caller start on what comes next
+                if on_draining and len(plans) - len(results) <= workers:
+                    on_draining()
+                    on_draining = None
+                record_result(completed.get())
+            if on_draining:
+                on_draining()
+        except BaseException:
+            # Don't wait for queued or in-flight downloads before reporting a failure or Ctrl-C;
+            # in-flight ones stop at their next chunk and remove their .part file
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    skipped_count += results.count(0)
+    failed_count = results.count(None)
+    total_size = sum(file_size for file_size in results if file_size)
+
+    print(f"\nTotal items downloaded: {total_items - skipped_count - failed_count}")
     print(f"Skipped items: {skipped_count}")
+    print(f"Failed items: {failed_count}")
     print(f"Total size downloaded: {humanize.naturalsize(total_size)}\n")
 
 
@@ -195,14 +437,39 @@ def get_service():
 
     return build("photoslibrary", "v1", credentials=creds, static_discovery=False)
 
-def main(start_year, start_month, end_year, end_month, ignore_cache=False):
+def main(start_year, start_month, end_year, end_month, ignore_cache=False, workers=MAX_WORKERS,
+         rate_limit=RATE_LIMIT, max_dim=None, durable=False):
     service = get_service()
-    for year, month in iterate_months(start_year, start_month, end_year, end_month):
-        print(f"********* Start **********\nProcessing month: {year}-{month:02d}\n\n")
-        handle_month(service, month, year, ignore_cache)
-        print(f"Processed month: {year}-{month:02d}\n********* End **********\n\n")
-
-def download_albums():
+    months = list(iterate_months(start_year, start_month, end_year, end_month))
+    # A single fetcher thread owns the API client and loads the next month during the current month's last
+    # downloads. Starting any earlier would let the next month's baseUrls (valid for 60 minutes) expire
+    stop = threading.Event()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as fetcher:
+        try:
+            items = prefetch_month_items(fetcher, service, months[0][1], months[0][0], ignore_cache, stop)
+            for index, (year, month) in enumerate(months):
+                prefetched = []
+                prefetch_next = None
+                if index + 1 < len(months):
+                    next_year, next_month = months[index + 1]
+
+                    def prefetch_next(next_year=next_year, next_month=next_month):
+                        prefetched.append(
+                            prefetch_month_items(fetcher, service, next_month, next_year, ignore_cache, stop))
+
+                print(f"********* Start **********\nProcessing month: {year}-{month:02d}\n\n")
+                handle_items(items, workers=workers, rate_limit=rate_limit, max_dim=max_dim, durable=durable,
+                             on_draining=prefetch_next)
+                print(f"Processed month: {year}-{month:02d}\n********* End **********\n\n")
+                if prefetched:
+                    items = prefetched[0]
+        except BaseException:
+            # Don't keep paging through the API for months that will never be downloaded
+            stop.set()
+            fetcher.shutdown(wait=False, cancel_futures=True)
+            raise
+
+def download_albums(max_dim=None):
     service = get_service()
     # List albums
     albums_result = service.albums().list(pageSize=50).execute()
@@ -215,10 +482,10 @@ def download_albums():
         album_id = album['id']
         album_title = album.get('title', 'unknown')
         print(f"********* Start **********\nProcessing album: {album_title}\n\n")
-        items = fetch_items_from_api(service, {"albumId": album_id,
-                                               "pageSize": "100",
-                                               "pageToken": None})
-        handle_items(items, base_path=f"./albums/{album_title}")
+        items = fetch_items_from_api(service, [{"albumId": album_id,
+                                                "pageSize": "100",
+                                                "pageToken": None}])
+        handle_items(items, base_path=os.path.join(get_base_path("./albums", max_dim), album_title), max_dim=max_dim)
         print(f"Processed month: {album_title}\n********* End **********\n\n")
 
 
@@ -243,6 +510,36 @@ def valid_month(value):
     except ValueError:
         raise argparse.ArgumentTypeError("Month must be an integer.")
 
+def valid_workers(value):
+    """Validate the workers input."""
+    try:
+        workers = int(value)
+        if workers < 1:
+            raise argparse.ArgumentTypeError("Workers must be a positive integer.")
+        return workers
+    except ValueError:
+        raise argparse.ArgumentTypeError("Workers must be an integer.")
+
+def valid_max_dim(value):
+    """Validate the max dimension input."""
+    try:
+        max_dim = int(value)
+        if max_dim < 1:
+            raise argparse.ArgumentTypeError("Max dimension must be a positive integer.")
+        return max_dim
+    except ValueError:
+        raise argparse.ArgumentTypeError("Max dimension must be an integer.")
+
+def valid_rate_limit(value):
+    """Validate the rate limit input."""
+    try:
+        rate_limit = float(value)
+        if rate_limit < 0:
+            raise argparse.ArgumentTypeError("Rate limit must not be negative.")
+        return rate_limit
+    except ValueError:
+        raise argparse.ArgumentTypeError("Rate limit must be a number.")
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Process a date range with validation.")
 
@@ -253,6 +550,14 @@ def parse_arguments():
     parser.add_argument('--end_month', type=valid_month, required=True, help="End month (1-12).")
     parser.add_argument('--disable-cache', action='store_true', default=False,
                         help="disable cache (default: False).")
+    parser.add_argument('--workers', type=valid_workers, default=MAX_WORKERS,
+                        help=f"number of concurrent downloads (default: {MAX_WORKERS}).")
+    parser.add_argument('--rate-limit', type=valid_rate_limit, default=RATE_LIMIT,
+                        help=f"maximum download requests per second, 0 to disable (default: {RATE_LIMIT}).")
+    parser.add_argument('--max-dim', type=valid_max_dim, default=None,
+                        help="download photos scaled to fit within this many pixels instead of the originals.")
+    parser.add_argument('--fsync', action='store_true', default=False,
+                        help="flush every downloaded file to disk before marking it complete (default: False).")
 
 
     args = parser.parse_args()
@@ -271,4 +576,5 @@ if __name__ == "__main__":
 
     print(f"Start Date: {args.start_year}-{args.start_month:02d}")
     print(f"End Date: {args.end_year}-{args.end_month:02d}")
-    main(args.start_year, args.start_month, args.end_year, args.end_month, args.disable_cache)
+    main(args.start_year, args.start_month, args.end_year, args.end_month, args.disable_cache, args.workers,
+         args.rate_limit, args.max_dim, args.fsync)